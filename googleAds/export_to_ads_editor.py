@@ -7,6 +7,11 @@ import json
 import csv
 from datetime import datetime
 
+try:
+    import orjson  # Optional: faster JSON parsing
+except ImportError:
+    orjson = None
+
 # All columns in Google Ads Editor export format
 COLUMNS = [
     "Campaign", "Labels", "Campaign Type", "Networks", "Budget", "Budget type",
@@ -46,51 +51,88 @@ COLUMNS = [
 ]
 
 
+# Default cell values shared across row builders
+ENABLED = "Enabled"
+DISABLED = "Disabled"
+MIN_BID = "0.01"
+ZERO_BID = "0.00"
+AUDIENCE_SEGMENTS = "Audience segments"
+FLEX_REACH_FULL = "Audience segments;Genders;Ages;Parental status;Household incomes"
+
+# Column positions, so rows can be built as plain lists
+COL_INDEX = {name: i for i, name in enumerate(COLUMNS)}
+
+# Positions of the fields written on every keyword/ad/location row
+CAMPAIGN_IDX = COL_INDEX["Campaign"]
+AD_GROUP_IDX = COL_INDEX["Ad Group"]
+CRITERION_TYPE_IDX = COL_INDEX["Criterion Type"]
+KEYWORD_IDX = COL_INDEX["Keyword"]
+FIRST_PAGE_BID_IDX = COL_INDEX["First page bid"]
+TOP_OF_PAGE_BID_IDX = COL_INDEX["Top of page bid"]
+FIRST_POSITION_BID_IDX = COL_INDEX["First position bid"]
+LOCATION_IDX = COL_INDEX["Location"]
+FINAL_URL_IDX = COL_INDEX["Final URL"]
+PATH_1_IDX = COL_INDEX["Path 1"]
+PATH_2_IDX = COL_INDEX["Path 2"]
+AD_TYPE_IDX = COL_INDEX["Ad type"]
+CAMPAIGN_STATUS_IDX = COL_INDEX["Campaign Status"]
+AD_GROUP_STATUS_IDX = COL_INDEX["Ad Group Status"]
+STATUS_IDX = COL_INDEX["Status"]
+
+# Positions of the numbered ad asset columns
+HEADLINE_IDX = [COL_INDEX[f"Headline {i}"] for i in range(1, 16)]
+HEADLINE_POS_IDX = [COL_INDEX[f"Headline {i} position"] for i in range(1, 16)]
+DESCRIPTION_IDX = [COL_INDEX[f"Description {i}"] for i in range(1, 5)]
+DESCRIPTION_POS_IDX = [COL_INDEX[f"Description {i} position"] for i in range(1, 5)]
+
+_EMPTY_ROW_TEMPLATE = [""] * len(COLUMNS)
+
+
 def create_empty_row():
-    """Create an empty row dict with all columns."""
-    return {col: "" for col in COLUMNS}
+    """Create an empty row list with all columns."""
+    return _EMPTY_ROW_TEMPLATE.copy()
 
 
 def create_campaign_row(campaign):
     """Create a campaign-level row."""
     row = create_empty_row()
-    row["Campaign"] = campaign["name"]
-    row["Campaign Type"] = campaign.get("type", "Search")
-    row["Networks"] = campaign.get("networks", "Google search")
-    row["Budget"] = campaign.get("budget", "")
-    row["Budget type"] = campaign.get("budget_type", "Daily")
-    row["Languages"] = campaign.get("languages", "en")
+    row[CAMPAIGN_IDX] = campaign["name"]
+    row[COL_INDEX["Campaign Type"]] = campaign.get("type", "Search")
+    row[COL_INDEX["Networks"]] = campaign.get("networks", "Google search")
+    row[COL_INDEX["Budget"]] = campaign.get("budget", "")
+    row[COL_INDEX["Budget type"]] = campaign.get("budget_type", "Daily")
+    row[COL_INDEX["Languages"]] = campaign.get("languages", "en")
 
     # Bid strategy
     bid_strategy = campaign.get("bid_strategy", "")
     if bid_strategy == "Target impression share":
-        row["Bid Strategy Type"] = "Target impression share"
-        row["Target impression share"] = campaign.get("target_impression_share", "")
-        row["Maximum CPC bid limit"] = campaign.get("max_cpc_limit", "")
-        row["Ad location"] = "Top of results page"
+        row[COL_INDEX["Bid Strategy Type"]] = "Target impression share"
+        row[COL_INDEX["Target impression share"]] = campaign.get("target_impression_share", "")
+        row[COL_INDEX["Maximum CPC bid limit"]] = campaign.get("max_cpc_limit", "")
+        row[COL_INDEX["Ad location"]] = "Top of results page"
     elif bid_strategy == "Manual CPC":
-        row["Bid Strategy Type"] = "Manual CPC"
-        row["Enhanced CPC"] = "Disabled"
+        row[COL_INDEX["Bid Strategy Type"]] = "Manual CPC"
+        row[COL_INDEX["Enhanced CPC"]] = DISABLED
     elif bid_strategy == "Maximize clicks":
-        row["Bid Strategy Type"] = "Maximize clicks"
+        row[COL_INDEX["Bid Strategy Type"]] = "Maximize clicks"
     else:
-        row["Bid Strategy Type"] = bid_strategy
-
-    row["Start Date"] = campaign.get("start_date", "")
-    row["Ad rotation"] = "Rotate indefinitely"
-    row["Targeting method"] = "Location of presence"
-    row["Exclusion method"] = "Location of presence"
-    row["Audience targeting"] = "Audience segments"
-    row["Flexible Reach"] = "Audience segments"
-    row["Text asset automation"] = "Disabled"
-    row["Final URL expansion"] = "Disabled"
-    row["Image enhancement"] = "Disabled"
-    row["Image generation"] = "Disabled"
-    row["Image extraction"] = "Disabled"
-    row["Video enhancement"] = "Disabled"
-    row["Brand guidelines"] = "Disabled"
-    row["Campaign Status"] = campaign.get("status", "Enabled")
-    row["Comment"] = campaign.get("comment", "")
+        row[COL_INDEX["Bid Strategy Type"]] = bid_strategy
+
+    row[COL_INDEX["Start Date"]] = campaign.get("start_date", "")
+    row[COL_INDEX["Ad rotation"]] = "Rotate indefinitely"
+    row[COL_INDEX["Targeting method"]] = "Location of presence"
+    row[COL_INDEX["Exclusion method"]] = "Location of presence"
+    row[COL_INDEX["Audience targeting"]] = AUDIENCE_SEGMENTS
+    row[COL_INDEX["Flexible Reach"]] = AUDIENCE_SEGMENTS
+    row[COL_INDEX["Text asset automation"]] = DISABLED
+    row[COL_INDEX["Final URL expansion"]] = DISABLED
+    row[COL_INDEX["Image enhancement"]] = DISABLED
+    row[COL_INDEX["Image generation"]] = DISABLED
+    row[COL_INDEX["Image extraction"]] = DISABLED
+    row[COL_INDEX["Video enhancement"]] = DISABLED
+    row[COL_INDEX["Brand guidelines"]] = DISABLED
+    row[CAMPAIGN_STATUS_IDX] = campaign.get("status", ENABLED)
+    row[COL_INDEX["Comment"]] = campaign.get("comment", "")
 
     return row
 
@@ -98,159 +140,171 @@ def create_campaign_row(campaign):
 def create_ad_group_row(campaign, ad_group):
     """Create an ad group-level row."""
     row = create_empty_row()
-    row["Campaign"] = campaign["name"]
-    row["Languages"] = "All"
-    row["Ad Group"] = ad_group["name"]
-    row["Max CPC"] = ad_group.get("max_cpc", "0.01")
-    row["Max CPM"] = "0.01"
-    row["Max CPV"] = ""
-    row["Target CPV"] = "0.01"
-    row["Percent CPC"] = ""
-    row["Target CPM"] = "0.01"
-    row["Optimized targeting"] = "Disabled"
-    row["Strict age and gender targeting"] = "Disabled"
-    row["Ad Group Type"] = "Standard"
-    row["Audience targeting"] = "Audience segments"
-    row["Flexible Reach"] = "Audience segments;Genders;Ages;Parental status;Household incomes"
-    row["Display Network Custom Bid Type"] = "None"
-    row["Ad rotation"] = "Optimize"
-    row["Campaign Status"] = campaign.get("status", "Enabled")
-    row["Ad Group Status"] = ad_group.get("status", "Enabled")
+    row[CAMPAIGN_IDX] = campaign["name"]
+    row[COL_INDEX["Languages"]] = "All"
+    row[AD_GROUP_IDX] = ad_group["name"]
+    row[COL_INDEX["Max CPC"]] = ad_group.get("max_cpc", MIN_BID)
+    row[COL_INDEX["Max CPM"]] = MIN_BID
+    row[COL_INDEX["Max CPV"]] = ""
+    row[COL_INDEX["Target CPV"]] = MIN_BID
+    row[COL_INDEX["Percent CPC"]] = ""
+    row[COL_INDEX["Target CPM"]] = MIN_BID
+    row[COL_INDEX["Optimized targeting"]] = DISABLED
+    row[COL_INDEX["Strict age and gender targeting"]] = DISABLED
+    row[COL_INDEX["Ad Group Type"]] = "Standard"
+    row[COL_INDEX["Audience targeting"]] = AUDIENCE_SEGMENTS
+    row[COL_INDEX["Flexible Reach"]] = FLEX_REACH_FULL
+    row[COL_INDEX["Display Network Custom Bid Type"]] = "None"
+    row[COL_INDEX["Ad rotation"]] = "Optimize"
+    row[CAMPAIGN_STATUS_IDX] = campaign.get("status", ENABLED)
+    row[AD_GROUP_STATUS_IDX] = ad_group.get("status", ENABLED)
 
     return row
 
 
-def create_keyword_row(campaign, ad_group, keyword):
+def create_keyword_row(camp_name, camp_status, ag_name, ag_status, keyword):
     """Create a keyword row."""
     row = create_empty_row()
-    row["Campaign"] = campaign["name"]
-    row["Ad Group"] = ad_group["name"]
-
-    # Handle match type
-    match_type = keyword.get("match_type", "Phrase")
-    if match_type.startswith("Negative"):
-        row["Criterion Type"] = match_type
-    else:
-        row["Criterion Type"] = match_type
-
-    row["Keyword"] = keyword.get("keyword", "")
-    row["First page bid"] = "0.00"
-    row["Top of page bid"] = "0.00"
-    row["First position bid"] = "0.00"
-    row["Campaign Status"] = campaign.get("status", "Enabled")
-    row["Ad Group Status"] = ad_group.get("status", "Enabled")
-    row["Status"] = keyword.get("status", "Enabled")
+    row[CAMPAIGN_IDX] = camp_name
+    row[AD_GROUP_IDX] = ag_name
+
+    # Match type, including "Negative ..." types for negative keywords
+    row[CRITERION_TYPE_IDX] = keyword.get("match_type", "Phrase")
+    row[KEYWORD_IDX] = keyword.get("keyword", "")
+    row[FIRST_PAGE_BID_IDX] = ZERO_BID
+    row[TOP_OF_PAGE_BID_IDX] = ZERO_BID
+    row[FIRST_POSITION_BID_IDX] = ZERO_BID
+    row[CAMPAIGN_STATUS_IDX] = camp_status
+    row[AD_GROUP_STATUS_IDX] = ag_status
+    row[STATUS_IDX] = keyword.get("status", ENABLED)
 
     return row
 
 
-def create_ad_row(campaign, ad_group, ad):
+def create_ad_row(camp_name, camp_status, ag_name, ag_status, ad):
     """Create a responsive search ad row."""
     row = create_empty_row()
-    row["Campaign"] = campaign["name"]
-    row["Ad Group"] = ad_group["name"]
+    row[CAMPAIGN_IDX] = camp_name
+    row[AD_GROUP_IDX] = ag_name
 
-    # Headlines (up to 15)
+    # Headlines (up to 15; zip stops at the last headline column)
     headlines = ad.get("headlines", [])
-    for i, headline in enumerate(headlines[:15], 1):
+    for text_idx, pos_idx, headline in zip(HEADLINE_IDX, HEADLINE_POS_IDX, headlines):
         text = headline.get("text", "") if isinstance(headline, dict) else headline
-        row[f"Headline {i}"] = text
+        row[text_idx] = text
 
         # Position
         position = headline.get("position", "") if isinstance(headline, dict) else ""
         if position:
-            row[f"Headline {i} position"] = position
+            row[pos_idx] = position
         else:
-            row[f"Headline {i} position"] = " -"
-
-    # Fill remaining headline positions with " -"
-    for i in range(len(headlines) + 1, 16):
-        row[f"Headline {i} position"] = ""
+            row[pos_idx] = " -"
 
     # Descriptions (up to 4)
     descriptions = ad.get("descriptions", [])
-    for i, desc in enumerate(descriptions[:4], 1):
+    for text_idx, pos_idx, desc in zip(DESCRIPTION_IDX, DESCRIPTION_POS_IDX, descriptions):
         text = desc.get("text", "") if isinstance(desc, dict) else desc
-        row[f"Description {i}"] = text
+        row[text_idx] = text
 
         position = desc.get("position", "") if isinstance(desc, dict) else ""
         if position:
-            row[f"Description {i} position"] = position
+            row[pos_idx] = position
         else:
-            row[f"Description {i} position"] = " -"
+            row[pos_idx] = " -"
 
-    row["Final URL"] = ad.get("final_url", "")
-    row["Path 1"] = ad.get("path1", "")
-    row["Path 2"] = ad.get("path2", "")
-    row["Ad type"] = "Responsive search ad"
-    row["Campaign Status"] = campaign.get("status", "Enabled")
-    row["Ad Group Status"] = ad_group.get("status", "Enabled")
-    row["Status"] = ad.get("status", "Enabled")
+    row[FINAL_URL_IDX] = ad.get("final_url", "")
+    row[PATH_1_IDX] = ad.get("path1", "")
+    row[PATH_2_IDX] = ad.get("path2", "")
+    row[AD_TYPE_IDX] = "Responsive search ad"
+    row[CAMPAIGN_STATUS_IDX] = camp_status
+    row[AD_GROUP_STATUS_IDX] = ag_status
+    row[STATUS_IDX] = ad.get("status", ENABLED)
 
     return row
 
 
-def create_location_row(campaign, location):
+def create_location_row(camp_name, camp_status, location):
     """Create a location targeting row."""
     row = create_empty_row()
-    row["Campaign"] = campaign["name"]
-    row["Location"] = location
-    row["Campaign Status"] = campaign.get("status", "Enabled")
-    row["Status"] = "Enabled"
+    row[CAMPAIGN_IDX] = camp_name
+    row[LOCATION_IDX] = location
+    row[CAMPAIGN_STATUS_IDX] = camp_status
+    row[STATUS_IDX] = ENABLED
 
     return row
 
 
-def convert_to_csv(json_path, output_path):
-    """Convert ads_data.json to Google Ads Editor CSV format."""
-    with open(json_path, 'r') as f:
-        data = json.load(f)
+class TeeWriter:
+    """File-like object that passes each write on to several text files."""
 
-    rows = []
+    def __init__(self, *files):
+        self.files = files
 
+    def write(self, text):
+        for f in self.files:
+            f.write(text)
+
+
+def iter_rows(data):
+    """Yield every CSV row for the campaigns in data, in export order."""
     for campaign in data.get("campaigns", []):
         # Campaign row
-        rows.append(create_campaign_row(campaign))
+        yield create_campaign_row(campaign)
+
+        # Fields repeated on every child row
+        camp_name = campaign["name"]
+        camp_status = campaign.get("status", ENABLED)
 
         # Location rows
         for location in campaign.get("locations", []):
-            rows.append(create_location_row(campaign, location))
+            yield create_location_row(camp_name, camp_status, location)
 
         # Ad groups
         for ad_group in campaign.get("ad_groups", []):
             # Ad group row
-            rows.append(create_ad_group_row(campaign, ad_group))
+            yield create_ad_group_row(campaign, ad_group)
+
+            ag_name = ad_group["name"]
+            ag_status = ad_group.get("status", ENABLED)
 
             # Keywords
             for keyword in ad_group.get("keywords", []):
-                rows.append(create_keyword_row(campaign, ad_group, keyword))
+                yield create_keyword_row(camp_name, camp_status, ag_name, ag_status, keyword)
 
             # Negative keywords
             for neg_keyword in ad_group.get("negative_keywords", []):
-                rows.append(create_keyword_row(campaign, ad_group, neg_keyword))
+                yield create_keyword_row(camp_name, camp_status, ag_name, ag_status, neg_keyword)
 
             # Ads
             for ad in ad_group.get("ads", []):
-                rows.append(create_ad_row(campaign, ad_group, ad))
+                yield create_ad_row(camp_name, camp_status, ag_name, ag_status, ad)
 
-    # Write CSV with UTF-16 encoding (Google Ads Editor format)
-    with open(output_path, 'w', newline='', encoding='utf-16') as f:
-        writer = csv.DictWriter(f, fieldnames=COLUMNS, delimiter='\t')
-        writer.writeheader()
-        writer.writerows(rows)
 
-    print(f"Exported {len(rows)} rows to {output_path}")
+def convert_to_csv(json_path, output_path):
+    """Convert ads_data.json to Google Ads Editor CSV format."""
+    if orjson:
+        with open(json_path, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(json_path, 'r') as f:
+            data = json.load(f)
 
-    # Also create a UTF-8 version for easier viewing
+    # Format each row once and write it to both files as it is produced
     utf8_path = output_path.replace('.csv', '_utf8.csv')
-    with open(utf8_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=COLUMNS, delimiter='\t')
-        writer.writeheader()
-        writer.writerows(rows)
-
+    # UTF-16 is the Google Ads Editor format; UTF-8 is for easier viewing
+    with open(output_path, 'w', newline='', encoding='utf-16') as utf16_file, \
+            open(utf8_path, 'w', newline='', encoding='utf-8') as utf8_file:
+        writer = csv.writer(TeeWriter(utf16_file, utf8_file), delimiter='\t')
+        writer.writerow(COLUMNS)
+        row_count = 0
+        for row in iter_rows(data):
+            writer.writerow(row)
+            row_count += 1
+
+    print(f"Exported {row_count} rows to {output_path}")
     print(f"Also created UTF-8 version at {utf8_path}")
 
-    return len(rows)
+    return row_count
 
 
 if __name__ == "__main__":
@@ -2,21 +2,31 @@
 """HTTP server with JSON save endpoint and password protection.
 Works locally and on cloud platforms (Railway, Render, Fly.io)."""
 
+import gzip
 import http.server
 import json
 import os
 import shutil
 import hmac
 import hashlib
+import collections
+import functools
 import secrets
+import threading
 import time
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from http.cookies import SimpleCookie
+
+try:
+    import orjson  # Optional: faster JSON load/save, stdlib json otherwise
+except ImportError:
+    orjson = None
 
 DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.environ.get('DATA_DIR', DIR)
 JSON_FILE = os.path.join(DATA_DIR, 'ads_data.json')
+JSON_GZ_FILE = JSON_FILE + '.gz'
 PORT = int(os.environ.get('PORT', 8080))
 
 # Auth config — set APP_PASSWORD env var to enable protection
@@ -24,6 +34,18 @@ APP_PASSWORD = os.environ.get('APP_PASSWORD', '')
 SECRET_KEY = os.environ.get('APP_SECRET', secrets.token_hex(32))
 SESSION_MAX_AGE = 60 * 60 * 24  # 24 hours
 
+# Keyed once; copied per token so the key pads aren't re-derived each time
+_BASE_HMAC = hmac.new(SECRET_KEY.encode(), digestmod=hashlib.sha256)
+
+# Requests are handled on separate threads; saves must not interleave
+SAVE_LOCK = threading.Lock()
+BACKUP_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+BACKUPS = collections.deque(maxlen=10)  # Backup paths, oldest first
+
+# JSON_GZ_FILE holds JSON_FILE as it was at this (mtime_ns, size, inode)
+GZIP_LOCK = threading.Lock()
+_gzip_source = None
+
 # On first deploy, copy ads_data.json to persistent volume if needed
 if DATA_DIR != DIR and not os.path.exists(JSON_FILE):
     src = os.path.join(DIR, 'ads_data.json')
@@ -32,6 +54,20 @@ if DATA_DIR != DIR and not os.path.exists(JSON_FILE):
         shutil.copy2(src, JSON_FILE)
         print(f'Copied ads_data.json to {DATA_DIR}')
 
+
+def list_backups():
+    """Return the backup paths in DATA_DIR, oldest first."""
+    if not os.path.isdir(DATA_DIR):
+        return []
+    return [
+        os.path.join(DATA_DIR, f) for f in sorted(os.listdir(DATA_DIR))
+        if f.startswith('ads_data_backup_') and f.endswith('.json')
+    ]
+
+
+# Pick up existing backups once; later saves track them in BACKUPS
+BACKUPS.extend(list_backups())  # maxlen keeps the newest 10
+
 LOGIN_PAGE = '''<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -127,47 +163,179 @@ LOGIN_PAGE = '''<!DOCTYPE html>
 </body>
 </html>'''
 
+# Both variants of the login page, rendered once
+LOGIN_PAGE_OK = LOGIN_PAGE.replace('{error}', '').encode('utf-8')
+LOGIN_PAGE_ERR = LOGIN_PAGE.replace(
+    '{error}', '<div class="error">Incorrect password. Please try again.</div>'
+).encode('utf-8')
+
+
+def sign_timestamp(timestamp):
+    """Return the raw HMAC signature for a session timestamp."""
+    h = _BASE_HMAC.copy()
+    h.update(f'session:{timestamp}'.encode())
+    return h.digest()
+
 
 def make_token(timestamp):
     """Create an HMAC-signed session token."""
-    msg = f'session:{timestamp}'.encode()
-    sig = hmac.new(SECRET_KEY.encode(), msg, hashlib.sha256).hexdigest()
-    return f'{timestamp}:{sig}'
+    return f'{timestamp}:{sign_timestamp(timestamp).hex()}'
 
 
 def verify_token(token):
     """Verify a session token is valid and not expired."""
     if not token:
         return False
+    return _verify_token_cached(token, int(time.time()) // 60)
+
+
+@functools.lru_cache(maxsize=256)
+def _verify_token_cached(token, minute):
+    """Check a token's expiry and signature, memoized for the current minute."""
     try:
         parts = token.split(':')
         if len(parts) != 2:
             return False
-        timestamp, sig = parts
-        timestamp = int(timestamp)
+        ts_str, sig = parts
+        timestamp = int(ts_str)
+        # Only accept the exact form make_token emits; bytes.fromhex alone
+        # would also take uppercase or space-separated hex
+        if ts_str != str(timestamp) or len(sig) != 64 or sig != sig.lower():
+            return False
         if time.time() - timestamp > SESSION_MAX_AGE:
             return False
-        expected = make_token(timestamp)
-        return hmac.compare_digest(token, expected)
+        return hmac.compare_digest(bytes.fromhex(sig), sign_timestamp(timestamp))
     except (ValueError, TypeError):
         return False
 
 
+def parse_json(raw):
+    """Parse a JSON request body."""
+    if orjson:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dump_json(data):
+    """Serialize data as indented UTF-8 JSON bytes for ads_data.json."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def accepts_gzip(accept_encoding):
+    """Whether an Accept-Encoding header allows gzip (q=0 means refused)."""
+    for part in accept_encoding.split(','):
+        coding, _, params = part.partition(';')
+        if coding.strip().lower() != 'gzip':
+            continue
+        params = params.strip().lower()
+        if not params.startswith('q='):
+            return True
+        try:
+            return float(params[2:]) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def open_json_gz():
+    """Open a gzipped copy of JSON_FILE, rebuilding it if it doesn't match."""
+    global _gzip_source
+    with open(JSON_FILE, 'rb') as src:
+        st = os.fstat(src.fileno())
+        source = (st.st_mtime_ns, st.st_size, st.st_ino)
+        with GZIP_LOCK:
+            if _gzip_source == source:
+                try:
+                    return open(JSON_GZ_FILE, 'rb')
+                except FileNotFoundError:
+                    _gzip_source = None  # Deleted behind our back; rebuild
+        # Compress from the fd we stat'ed, so the gz matches `source` even if
+        # a save replaces JSON_FILE meanwhile
+        tmp = f'{JSON_GZ_FILE}.{threading.get_ident()}.tmp'
+        try:
+            with gzip.open(tmp, 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst)
+            with GZIP_LOCK:
+                os.replace(tmp, JSON_GZ_FILE)
+                _gzip_source = source
+                return open(JSON_GZ_FILE, 'rb')
+        except Exception:
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+
+def invalidate_gzip_cache():
+    """Drop the gzipped copy of JSON_FILE after it changes."""
+    global _gzip_source
+    with GZIP_LOCK:
+        _gzip_source = None
+        try:
+            os.remove(JSON_GZ_FILE)
+        except FileNotFoundError:
+            pass
+
+
+def remove_backup(path):
+    """Delete a backup that fell out of BACKUPS (runs on BACKUP_EXECUTOR)."""
+    try:
+        os.remove(path)
+    except OSError as e:
+        print(f'  Backup cleanup failed: {e}')
+
+
+def save_json(data):
+    """Back up the current JSON_FILE, then replace it with data."""
+    payload = dump_json(data)
+    tmp = JSON_FILE + '.tmp'
+    with SAVE_LOCK:
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # Keep a backup before saving. JSON_FILE is replaced rather than
+        # rewritten, so a hardlink to the old inode is enough.
+        if os.path.exists(JSON_FILE):
+            ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+            backup = JSON_FILE.replace('.json', f'_backup_{ts}.json')
+            if os.path.exists(backup):
+                os.remove(backup)
+            try:
+                os.link(JSON_FILE, backup)
+            except OSError:
+                shutil.copy2(JSON_FILE, backup)  # No hardlink support
+            # Keep only last 10 backups; delete the evicted one off the request path
+            if backup not in BACKUPS:
+                if len(BACKUPS) == BACKUPS.maxlen:
+                    BACKUP_EXECUTOR.submit(remove_backup, BACKUPS[0])
+                BACKUPS.append(backup)
+        os.replace(tmp, JSON_FILE)
+        invalidate_gzip_cache()
+
+
 class Handler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=DIR, **kwargs)
 
     def get_session_token(self):
         """Extract session token from cookies."""
-        cookie_header = self.headers.get('Cookie', '')
-        cookie = SimpleCookie()
-        try:
-            cookie.load(cookie_header)
-        except Exception:
+        cookie_header = self.headers.get('Cookie')
+        if not cookie_header:
+            return None
+        # Tokens are a plain "ts:sig", so scan for the cookie directly
+        # rather than parsing the whole header with SimpleCookie
+        start = cookie_header.find('session=')
+        while start > 0 and cookie_header[start - 1] not in '; ':
+            start = cookie_header.find('session=', start + 1)
+        if start < 0:
             return None
-        if 'session' in cookie:
-            return cookie['session'].value
-        return None
+        value = cookie_header[start + 8:]
+        end = value.find(';')
+        return value if end < 0 else value[:end]
 
     def is_authenticated(self):
         """Check if request has a valid session."""
@@ -175,15 +343,15 @@ class Handler(http.server.SimpleHTTPRequestHandler):
             return True  # No password set, auth disabled
         return verify_token(self.get_session_token())
 
-    def send_login_page(self, error=''):
-        """Serve the login page."""
-        error_html = f'<div class="error">{error}</div>' if error else ''
-        page = LOGIN_PAGE.replace('{error}', error_html)
+    def send_login_page(self, error=False):
+        """Serve the login page, with the incorrect-password banner if error."""
+        page = LOGIN_PAGE_ERR if error else LOGIN_PAGE_OK
         self.send_response(200)
         self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(page)))
         self.send_header('Cache-Control', 'no-store')
         self.end_headers()
-        self.wfile.write(page.encode('utf-8'))
+        self.wfile.write(page)
 
     def set_session_cookie(self):
         """Set a signed session cookie."""
@@ -217,18 +385,33 @@ class Handler(http.server.SimpleHTTPRequestHandler):
 
         # Serve ads_data.json from DATA_DIR (persistent volume)
         if self.path == '/ads_data.json':
+            f, content_encoding = None, None
+            if accepts_gzip(self.headers.get('Accept-Encoding', '')):
+                try:
+                    f, content_encoding = open_json_gz(), 'gzip'
+                except OSError:
+                    pass  # Fall back to the uncompressed file
             try:
-                with open(JSON_FILE, 'r', encoding='utf-8') as f:
-                    data = f.read()
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Cache-Control', 'no-cache')
-                self.end_headers()
-                self.wfile.write(data.encode('utf-8'))
+                if f is None:
+                    f = open(JSON_FILE, 'rb')
             except Exception as e:
                 self.send_response(500)
                 self.end_headers()
                 self.wfile.write(str(e).encode())
+                return
+            with f:
+                size = os.fstat(f.fileno()).st_size
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(size))
+                if content_encoding:
+                    self.send_header('Content-Encoding', content_encoding)
+                self.send_header('Vary', 'Accept-Encoding')
+                self.send_header('Cache-Control', 'no-cache')
+                self.end_headers()
+                # Already encoded on disk; sendfile() copies it kernel-side
+                # (socket.sendfile falls back to send() where unsupported)
+                self.connection.sendfile(f, 0, size)
             return
         # Redirect root to editor
         if self.path == '/':
@@ -256,7 +439,7 @@ class Handler(http.server.SimpleHTTPRequestHandler):
                 print(f'  Login successful from {self.client_address[0]}')
             else:
                 print(f'  Failed login attempt from {self.client_address[0]}')
-                self.send_login_page(error='Incorrect password. Please try again.')
+                self.send_login_page(error=True)
             return
 
         # Logout handler
@@ -278,21 +461,7 @@ class Handler(http.server.SimpleHTTPRequestHandler):
 
         if self.path == '/save':
             try:
-                data = json.loads(body)
-                # Keep a backup before saving
-                if os.path.exists(JSON_FILE):
-                    ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-                    backup = JSON_FILE.replace('.json', f'_backup_{ts}.json')
-                    shutil.copy2(JSON_FILE, backup)
-                    # Keep only last 10 backups
-                    backups = sorted([
-                        f for f in os.listdir(DATA_DIR)
-                        if f.startswith('ads_data_backup_') and f.endswith('.json')
-                    ])
-                    for old in backups[:-10]:
-                        os.remove(os.path.join(DATA_DIR, old))
-                with open(JSON_FILE, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
+                save_json(parse_json(body))
                 self.send_response(200)
                 self.send_header('Content-Type', 'application/json')
                 self.end_headers()
@@ -320,11 +489,16 @@ class Handler(http.server.SimpleHTTPRequestHandler):
             super().log_message(format, *args)
 
 
-if APP_PASSWORD:
-    print(f'Auth ENABLED — password required to access editor')
-else:
-    print(f'Auth DISABLED — set APP_PASSWORD env var to enable')
-print(f'Serving at http://localhost:{PORT}/ads_editor.html')
-print(f'JSON file: {JSON_FILE}')
-print(f'Data dir:  {DATA_DIR}')
-http.server.HTTPServer(('0.0.0.0', PORT), Handler).serve_forever()
+if __name__ == '__main__':
+    # Keep only last 10 backups from earlier runs; later saves evict via BACKUPS
+    for old in list_backups()[:-BACKUPS.maxlen]:
+        os.remove(old)
+    if APP_PASSWORD:
+        print(f'Auth ENABLED — password required to access editor')
+    else:
+        print(f'Auth DISABLED — set APP_PASSWORD env var to enable')
+    print(f'Serving at http://localhost:{PORT}/ads_editor.html')
+    print(f'JSON file: {JSON_FILE}')
+    print(f'Data dir:  {DATA_DIR}')
+    server = http.server.ThreadingHTTPServer(('0.0.0.0', PORT), Handler)
+    server.serve_forever()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Tests for export_to_ads_editor.py. Run with: python3 -m unittest test_export_to_ads_editor"""
+
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import export_to_ads_editor as export
+
+HEADLINES = [{"text": "Fowler Homes Ashburton", "position": "1"}, "Award Winning Builder"] + [
+    {"text": f"Headline text {i}", "position": ""} for i in range(3, 17)
+]
+
+DATA = {
+    "campaigns": [
+        {
+            "name": "Ashburton | Brand",
+            "bid_strategy": "Manual CPC",
+            "locations": ["Ashburton, Canterbury, New Zealand"],
+            "ad_groups": [
+                {
+                    "name": "Ashburton",
+                    "keywords": [{"keyword": "house builders ashburton"}],
+                    "negative_keywords": [
+                        {"keyword": "bust", "match_type": "Negative Phrase", "status": "Paused"}
+                    ],
+                    "ads": [
+                        {
+                            "headlines": HEADLINES,
+                            "descriptions": [{"text": "Build with us.", "position": "1"}, "Talk to us today."],
+                            "final_url": "https://www.fowlerhomes.co.nz/",
+                            "path1": "ashburton",
+                        }
+                    ],
+                }
+            ],
+        }
+    ]
+}
+
+
+class ConvertToCsvTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        json_path = os.path.join(self.tmp, "ads_data.json")
+        with open(json_path, "w") as f:
+            json.dump(DATA, f)
+        self.csv_path = os.path.join(self.tmp, "export.csv")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.row_count = export.convert_to_csv(json_path, self.csv_path)
+        with open(self.csv_path, newline="", encoding="utf-16") as f:
+            self.text = f.read()
+        reader = csv.reader(io.StringIO(self.text, newline=""), delimiter="\t")
+        self.header = next(reader)
+        self.rows = [dict(zip(self.header, row)) for row in reader]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_header_and_row_count(self):
+        self.assertEqual(self.header, export.COLUMNS)
+        # Campaign, location, ad group, keyword, negative keyword, ad
+        self.assertEqual(self.row_count, 6)
+        self.assertEqual(len(self.rows), 6)
+        self.assertTrue(all(len(row) == len(export.COLUMNS) for row in self.rows))
+
+    def test_utf8_copy_matches(self):
+        with open(self.csv_path.replace(".csv", "_utf8.csv"), newline="", encoding="utf-8") as f:
+            self.assertEqual(f.read(), self.text)
+
+    def test_campaign_and_location_rows(self):
+        campaign, location = self.rows[0], self.rows[1]
+        self.assertEqual(campaign["Campaign"], "Ashburton | Brand")
+        self.assertEqual(campaign["Bid Strategy Type"], "Manual CPC")
+        self.assertEqual(campaign["Enhanced CPC"], "Disabled")
+        self.assertEqual(campaign["Campaign Status"], "Enabled")
+        self.assertEqual(campaign["Ad Group"], "")
+        self.assertEqual(location["Location"], "Ashburton, Canterbury, New Zealand")
+        self.assertEqual(location["Status"], "Enabled")
+
+    def test_ad_group_row(self):
+        ad_group = self.rows[2]
+        self.assertEqual(ad_group["Ad Group"], "Ashburton")
+        self.assertEqual(ad_group["Max CPC"], "0.01")
+        self.assertEqual(ad_group["Flexible Reach"], export.FLEX_REACH_FULL)
+        self.assertEqual(ad_group["Ad Group Status"], "Enabled")
+
+    def test_keyword_rows(self):
+        keyword, negative = self.rows[3], self.rows[4]
+        self.assertEqual(keyword["Keyword"], "house builders ashburton")
+        self.assertEqual(keyword["Criterion Type"], "Phrase")
+        self.assertEqual(keyword["First page bid"], "0.00")
+        self.assertEqual(keyword["Status"], "Enabled")
+        self.assertEqual(negative["Criterion Type"], "Negative Phrase")
+        self.assertEqual(negative["Status"], "Paused")
+        self.assertEqual(negative["Campaign Status"], "Enabled")
+
+    def test_ad_row(self):
+        ad = self.rows[5]
+        self.assertEqual(ad["Ad type"], "Responsive search ad")
+        self.assertEqual(ad["Headline 1"], "Fowler Homes Ashburton")
+        self.assertEqual(ad["Headline 1 position"], "1")
+        self.assertEqual(ad["Headline 2"], "Award Winning Builder")
+        self.assertEqual(ad["Headline 2 position"], " -")
+        self.assertEqual(ad["Headline 15"], "Headline text 15")
+        self.assertEqual(ad["Headline 15 position"], " -")
+        self.assertNotIn("Headline text 16", ad.values())
+        self.assertEqual(ad["Description 1 position"], "1")
+        self.assertEqual(ad["Description 2"], "Talk to us today.")
+        self.assertEqual(ad["Description 2 position"], " -")
+        self.assertEqual(ad["Description 3 position"], "")
+        self.assertEqual(ad["Path 1"], "ashburton")
+        self.assertEqual(ad["Path 2"], "")
+        self.assertEqual(ad["Status"], "Enabled")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Tests for server.py helpers. Run with: python3 -m unittest test_server"""
+
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+DATA_DIR = tempfile.mkdtemp()
+os.environ['DATA_DIR'] = DATA_DIR
+os.environ['APP_SECRET'] = 'test-secret'
+
+# More backups than the server keeps, left over from an earlier run
+OLD_BACKUPS = [
+    os.path.join(DATA_DIR, f'ads_data_backup_20200101_0000{i:02d}.json') for i in range(12)
+]
+for path in OLD_BACKUPS:
+    with open(path, 'w') as f:
+        f.write('{}')
+
+import server  # noqa: E402  (reads DATA_DIR at import)
+
+FILES_AFTER_IMPORT = set(os.listdir(DATA_DIR))
+BACKUPS_AFTER_IMPORT = list(server.BACKUPS)
+
+
+def tearDownModule():
+    server.BACKUP_EXECUTOR.shutdown(wait=True)
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+
+class BackupsAtImportTest(unittest.TestCase):
+    def test_import_tracks_but_does_not_delete_backups(self):
+        for path in OLD_BACKUPS:
+            self.assertIn(os.path.basename(path), FILES_AFTER_IMPORT)
+        self.assertEqual(BACKUPS_AFTER_IMPORT, OLD_BACKUPS[-10:])
+
+
+class GzipCacheTest(unittest.TestCase):
+    def setUp(self):
+        server.invalidate_gzip_cache()
+        server.save_json({'version': 1})
+
+    def read_gz(self):
+        with server.open_json_gz() as f:
+            return server.parse_json(gzip.decompress(f.read()))
+
+    def test_rebuild_overlapping_save_is_not_served_after(self):
+        started, saved = threading.Event(), threading.Event()
+        copyfileobj = shutil.copyfileobj
+
+        def slow_copy(src, dst):
+            started.set()
+            saved.wait(5)
+            copyfileobj(src, dst)
+
+        results = []
+        with mock.patch.object(server.shutil, 'copyfileobj', slow_copy):
+            rebuild = threading.Thread(target=lambda: results.append(self.read_gz()))
+            rebuild.start()
+            self.assertTrue(started.wait(5))
+            server.save_json({'version': 2})
+            saved.set()
+            rebuild.join(5)
+
+        # The overlapping request may see the old data, but nothing after it
+        self.assertEqual(results, [{'version': 1}])
+        self.assertEqual(self.read_gz(), {'version': 2})
+
+    def test_restore_with_older_mtime_rebuilds(self):
+        self.read_gz()
+        # Like restoring a backup with `cp -p`: new content, older mtime
+        backup = os.path.join(DATA_DIR, 'restore.json')
+        with open(backup, 'wb') as f:
+            f.write(server.dump_json({'version': 0}))
+        os.utime(backup, ns=(0, 0))
+        os.replace(backup, server.JSON_FILE)
+        self.assertEqual(self.read_gz(), {'version': 0})
+
+    def test_deleted_gz_is_rebuilt(self):
+        self.read_gz()
+        os.remove(server.JSON_GZ_FILE)
+        self.assertEqual(self.read_gz(), {'version': 1})
+
+    def test_failed_rebuild_leaves_no_temp_file(self):
+        def failing_copy(src, dst):
+            raise OSError('No space left on device')
+
+        with mock.patch.object(server.shutil, 'copyfileobj', failing_copy):
+            with self.assertRaises(OSError):
+                server.open_json_gz()
+        self.assertEqual([f for f in os.listdir(DATA_DIR) if f.endswith('.tmp')], [])
+
+
+class AcceptsGzipTest(unittest.TestCase):
+    def test_accepts(self):
+        for header in ('gzip', 'gzip, deflate, br', 'deflate, GZIP;q=0.5', 'gzip; q=1'):
+            self.assertTrue(server.accepts_gzip(header), header)
+
+    def test_refuses(self):
+        for header in ('', 'deflate, br', 'gzip;q=0', 'gzip;q=0.0, br', 'x-gzip'):
+            self.assertFalse(server.accepts_gzip(header), header)
+
+
+class GetSessionTokenTest(unittest.TestCase):
+    def token_for(self, cookie_header):
+        handler = server.Handler.__new__(server.Handler)  # skip socket setup
+        handler.headers = {} if cookie_header is None else {'Cookie': cookie_header}
+        return handler.get_session_token()
+
+    def test_cookie_headers(self):
+        cases = [
+            (None, None),
+            ('', None),
+            ('session=1:ab', '1:ab'),
+            ('a=1; session=1:ab', '1:ab'),
+            ('a=1;session=x; b=2', 'x'),
+            ('mysession=x; session=y', 'y'),
+            ('xsession=1', None),
+            ('a=session=1', None),
+        ]
+        for header, expected in cases:
+            self.assertEqual(self.token_for(header), expected, header)
+
+
+class VerifyTokenTest(unittest.TestCase):
+    def setUp(self):
+        self.ts = int(server.time.time())
+        self.token = server.make_token(self.ts)
+
+    def test_accepts_issued_token(self):
+        self.assertTrue(server.verify_token(self.token))
+
+    def test_rejects_non_canonical_variants(self):
+        ts, sig = self.token.split(':')
+        variants = [
+            f'{ts}:{sig.upper()}',
+            f'0{ts}:{sig}',
+            f' {ts}:{sig}',
+            f'{ts}:{sig[:8]} {sig[8:]}',
+            f'{ts}:{sig[:-1]}',
+            f'{ts}:{sig}00',
+        ]
+        for token in variants:
+            self.assertFalse(server.verify_token(token), token)
+
+    def test_rejects_expired_token(self):
+        old = self.ts - server.SESSION_MAX_AGE - 1
+        self.assertFalse(server.verify_token(server.make_token(old)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,9 @@
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 import os
 
 port = int(os.environ.get("PORT", 8080))
 
 handler = SimpleHTTPRequestHandler
-httpd = HTTPServer(("0.0.0.0", port), handler)
+httpd = ThreadingHTTPServer(("0.0.0.0", port), handler)
 print(f"Serving on port {port}")
 httpd.serve_forever()